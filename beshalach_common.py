@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+"""
+Shared text helpers for the Parshat Beshalach output scripts
+(generate_html_output.py, generate_formatted_doc.py)
+"""
+
+import re
+
+_TAG_RE = re.compile(r'<[^>]+>')
+
+
+def clean_html_tags(text: str) -> str:
+    """Remove HTML tags from text"""
+    text = _TAG_RE.sub('', text)
+    return ' '.join(text.split())
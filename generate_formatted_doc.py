@@ -6,51 +6,73 @@ ONLY include entries where summary and content are from the SAME author
 """
 
 import json
-import re
 from docx import Document
 from docx.shared import Pt, Inches, Cm
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 
+from beshalach_common import clean_html_tags
+
+RTL_STYLE = 'DavidRTL'
+
+# Run font sizes
+_PT_HEADER = Pt(16)
+_PT_SUMMARY = Pt(14)
+_PT_SEPARATOR = Pt(10)
+_PT_SOURCE_HEADER = Pt(14)
+_PT_CONTENT = Pt(11)
+
+# Clark-notation attribute names, resolved once
+_W_VAL = qn('w:val')
+_W_CS = qn('w:cs')
+
 
 def set_rtl_document(doc):
     """Set entire document to RTL"""
     # Set document-level RTL
     settings = doc.settings.element
     bidi = OxmlElement('w:bidiVisual')
-    bidi.set(qn('w:val'), '1')
+    bidi.set(_W_VAL, '1')
     settings.append(bidi)
 
 
-def set_rtl_paragraph(paragraph):
-    """Set paragraph to RTL for Hebrew text"""
-    pPr = paragraph._p.get_or_add_pPr()
+def add_rtl_style(doc):
+    """
+    Add the 'DavidRTL' paragraph style: RTL, right-aligned, David font
+    (including the complex-script font Word uses for Hebrew).
+    Defined once so paragraphs/runs don't each need their own RTL/font XML.
+    """
+    style = doc.styles.add_style(RTL_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    style.base_style = doc.styles['Normal']
+
+    style.font.name = 'David'
+    style.font.rtl = True
+    style.element.get_or_add_rPr().rFonts.set(_W_CS, 'David')
 
-    # Add bidi element
+    pPr = style.element.get_or_add_pPr()
     bidi = OxmlElement('w:bidi')
-    bidi.set(qn('w:val'), '1')
+    bidi.set(_W_VAL, '1')
     pPr.append(bidi)
+    style.paragraph_format.alignment = WD_ALIGN_PARAGRAPH.RIGHT
 
-    # Add RTL justification
-    jc = OxmlElement('w:jc')
-    jc.set(qn('w:val'), 'right')
-    pPr.append(jc)
 
+def add_rtl_paragraph(doc):
+    """Add a paragraph in the 'DavidRTL' style"""
+    paragraph = doc.add_paragraph()
+    # Set pStyle directly: paragraph.style = ... scans the whole style sheet per call
+    paragraph._p.get_or_add_pPr().style = RTL_STYLE
+    return paragraph
 
-def set_rtl_run(run):
-    """Set run to RTL"""
-    rPr = run._r.get_or_add_rPr()
-    rtl = OxmlElement('w:rtl')
-    rtl.set(qn('w:val'), '1')
-    rPr.append(rtl)
 
-
-def clean_html_tags(text: str) -> str:
-    """Remove HTML tags from text"""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+def add_sized_run(paragraph, text: str, size, bold: bool = False):
+    """Add a run with the given font size, e.g. _PT_CONTENT (font/RTL come from the paragraph style)"""
+    run = paragraph.add_run(text)
+    if bold:
+        run.bold = True
+    run.font.size = size
+    return run
 
 
 def extract_content_for_author(author_name: str, source_lines: list, start_line: int, end_line: int) -> str:
@@ -73,6 +95,7 @@ def create_document(mapping_data: dict, source_file: str, output_file: str):
 
     # Set document to RTL
     set_rtl_document(doc)
+    add_rtl_style(doc)
 
     # Set up page
     section = doc.sections[0]
@@ -86,12 +109,15 @@ def create_document(mapping_data: dict, source_file: str, output_file: str):
     # Set section to RTL
     sectPr = section._sectPr
     bidi = OxmlElement('w:bidi')
-    bidi.set(qn('w:val'), '1')
+    bidi.set(_W_VAL, '1')
     sectPr.append(bidi)
 
     entry_count = 0
     skipped_count = 0
 
+    # Cleaned content per (start_line, end_line): many summaries map to the same section
+    content_cache = {}
+
     for author_data in mapping_data['authors']:
         author_name = author_data['name']
 
@@ -117,70 +143,55 @@ def create_document(mapping_data: dict, source_file: str, output_file: str):
                 skipped_count += 1
                 continue
 
-            content_text = extract_content_for_author(author_name, source_lines, start_line, end_line)
+            content_key = (start_line, end_line)
+            content_text = content_cache.get(content_key)
+            if content_text is None:
+                content_text = extract_content_for_author(author_name, source_lines, start_line, end_line)
+                content_cache[content_key] = content_text
 
             if len(content_text) < 100:  # Skip if content too short
                 skipped_count += 1
                 continue
 
+            # Page break between entries (not after the last one)
+            if entry_count:
+                doc.add_page_break()
+
             entry_count += 1
 
             # === SUMMARY SECTION (TOP) ===
 
             # Header: Opening words - Author name
-            header_para = doc.add_paragraph()
-            set_rtl_paragraph(header_para)
+            header_para = add_rtl_paragraph(doc)
 
-            run = header_para.add_run(f"{opening_words} - {author_name}")
-            run.bold = True
-            run.font.size = Pt(16)
-            run.font.name = 'David'
-            set_rtl_run(run)
+            add_sized_run(header_para, f"{opening_words} - {author_name}", _PT_HEADER, bold=True)
 
             # Summary text
-            summary_para = doc.add_paragraph()
-            set_rtl_paragraph(summary_para)
+            summary_para = add_rtl_paragraph(doc)
 
-            run = summary_para.add_run(summary_text)
-            run.font.size = Pt(14)
-            run.font.name = 'David'
-            set_rtl_run(run)
+            add_sized_run(summary_para, summary_text, _PT_SUMMARY)
 
             # === CONTENT SECTION (BOTTOM - FOOTNOTE STYLE) ===
 
             # Separator line
-            sep_para = doc.add_paragraph()
-            set_rtl_paragraph(sep_para)
+            sep_para = add_rtl_paragraph(doc)
             sep_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            run = sep_para.add_run("_" * 60)
-            run.font.size = Pt(10)
+            add_sized_run(sep_para, "_" * 60, _PT_SEPARATOR)
 
             # "מקור השפע" header
-            source_header = doc.add_paragraph()
-            set_rtl_paragraph(source_header)
+            source_header = add_rtl_paragraph(doc)
             source_header.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
-            run = source_header.add_run("מקור השפע")
-            run.bold = True
-            run.font.size = Pt(14)
-            run.font.name = 'David'
-            set_rtl_run(run)
+            add_sized_run(source_header, "מקור השפע", _PT_SOURCE_HEADER, bold=True)
 
             # Content text
-            content_para = doc.add_paragraph()
-            set_rtl_paragraph(content_para)
+            content_para = add_rtl_paragraph(doc)
 
             # Truncate if too long
             if len(content_text) > 3000:
                 content_text = content_text[:3000] + "..."
 
-            run = content_para.add_run(f"[{entry_count}] {content_text}")
-            run.font.size = Pt(11)
-            run.font.name = 'David'
-            set_rtl_run(run)
-
-            # Page break between entries
-            doc.add_page_break()
+            add_sized_run(content_para, f"[{entry_count}] {content_text}", _PT_CONTENT)
 
     # Save document
     doc.save(output_file)
@@ -5,37 +5,137 @@ Find the SPECIFIC paragraph in content that matches each summary's opening words
 """
 
 import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Tuple, Optional
 
+from beshalach_common import clean_html_tags
 
-def clean_html_tags(text: str) -> str:
-    """Remove HTML tags from text"""
-    text = re.sub(r'<[^>]+>', '', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+# normalize_for_matching: drop nikud, turn punctuation into spaces (one translate pass)
+_NORMALIZE_TABLE = {c: None for c in range(0x0591, 0x05C8)}
+_NORMALIZE_TABLE.update({ord(c): ' ' for c in '.,;:!?-\u2013\u2014()[]"\''})
 
+# Summary index: author header, summary line (<b>Opening</b>-text), trailing page number
+_AUTHOR_HEADER_RE = re.compile(r'<center><b>([^<]+)</b></center>')
+_SUMMARY_RE = re.compile(r'^<b>([^<]+)</b>[\-–—](.+)$')
+_PAGE_DOTS_RE = re.compile(r'\.{2,}[א-ת"\']+\s*$')
+_PAGE_TAIL_RE = re.compile(r'\s+[א-ת][\'"]?[א-ת]?\s*$')
 
+# Content: whole line containing an author header (first header on the line)
+_AUTHOR_H1_LINE_RE = re.compile(r'^.*?<center><h1>(?:<b>)?([^<\n]+)(?:</b>)?</h1></center>.*$', re.MULTILINE)
+
+# Static parts of the generated HTML document
+_HTML_HEAD = '''<!DOCTYPE html>
+<html dir="rtl" lang="he">
+<head>
+    <meta charset="UTF-8">
+    <title>פרשת בשלח - ליקוטי ספרי חסידות</title>
+    <style>
+        @page {
+            size: A4;
+            margin: 2cm;
+        }
+        body {
+            font-family: 'David', 'Times New Roman', serif;
+            direction: rtl;
+            text-align: right;
+            line-height: 1.6;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+        }
+        .entry {
+            page-break-after: always;
+            margin-bottom: 40px;
+        }
+        .entry:last-child {
+            page-break-after: avoid;
+        }
+        .header {
+            font-size: 18pt;
+            font-weight: bold;
+            margin-bottom: 15px;
+            color: #333;
+        }
+        .summary {
+            font-size: 14pt;
+            margin-bottom: 30px;
+            text-align: justify;
+        }
+        .separator {
+            border-top: 1px solid #999;
+            margin: 20px 0;
+        }
+        .source-header {
+            font-size: 14pt;
+            font-weight: bold;
+            text-align: center;
+            margin: 15px 0;
+            text-decoration: underline;
+        }
+        .content {
+            font-size: 11pt;
+            text-align: justify;
+            color: #444;
+        }
+        .entry-number {
+            font-weight: bold;
+        }
+        h1 {
+            text-align: center;
+            font-size: 24pt;
+            margin-bottom: 30px;
+        }
+    </style>
+</head>
+<body>
+    <h1>פרשת בשלח</h1>
+    <h2 style="text-align: center;">ליקוטי ספרי חסידות עם מפתח ענינים</h2>
+'''
+
+# Escape text fields for element content (one translate pass per field);
+# '"' is left alone: it is the gershayim in abbreviations and never lands in an attribute
+_HTML_ESCAPE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
+
+# One entry: (opening words, author, summary text, entry number, paragraph)
+_ENTRY_TPL = '''
+    <div class="entry">
+        <div class="header">%s - %s</div>
+        <div class="summary">%s</div>
+        <div class="separator"></div>
+        <div class="source-header">מקור השפע</div>
+        <div class="content">
+            <span class="entry-number">[%d]</span> %s
+        </div>
+    </div>
+'''
+
+_HTML_TAIL = '''
+</body>
+</html>
+'''
+
+
+@dataclass(slots=True)
+class Entry:
+    author: str
+    opening_words: str  # Bold opening words of the summary
+    summary_text: str   # Summary with page number and tags removed
+    full_content: str   # Matching content paragraph
+
+
+@lru_cache(maxsize=None)
 def normalize_for_matching(text: str) -> str:
     """Normalize text for matching"""
-    text = re.sub(r'[\u0591-\u05C7]', '', text)  # Remove nikud
-    text = re.sub(r'[.,;:!?\-\u2013\u2014\(\)\[\]\"\'"]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    return ' '.join(text.translate(_NORMALIZE_TABLE).split())
 
 
-def find_matching_paragraph(opening_words: str, content_text: str) -> Optional[str]:
+def split_paragraphs(lines: List[str]) -> List[str]:
     """
-    Find the specific paragraph in content that starts with the opening words.
-    Returns the full paragraph text.
+    Group a content section's lines into cleaned paragraphs (separated by blank lines).
+    Done once per section so every summary can reuse the same paragraph list.
     """
-    opening_norm = normalize_for_matching(opening_words)
-
-    # Split content into paragraphs (by double newline or by <b> tags in original)
-    # First, let's find paragraphs that start with bold text
     paragraphs = []
-
-    # Split by common paragraph markers
-    lines = content_text.split('\n')
     current_para = []
 
     for line in lines:
@@ -50,81 +150,97 @@ def find_matching_paragraph(opening_words: str, content_text: str) -> Optional[s
     if current_para:
         paragraphs.append(' '.join(current_para))
 
+    return paragraphs
+
+
+def find_matching_paragraph(opening_words: str, paragraphs: List[str]) -> Optional[str]:
+    """
+    Find the specific paragraph in content that starts with the opening words.
+    Takes the section already split by split_paragraphs().
+    Returns the full paragraph text.
+
+    Paragraphs are normalized lazily through the normalize_for_matching cache, so
+    each one is normalized at most once no matter how many summaries scan it.
+    """
+    opening_norm = normalize_for_matching(opening_words)
+
     # Find paragraph that starts with our opening words
     for para in paragraphs:
         para_norm = normalize_for_matching(para)
         if para_norm.startswith(opening_norm):
             return para
         # Also check if opening words appear at start after some prefix
-        if opening_norm in para_norm[:len(opening_norm) + 50]:
+        if para_norm.find(opening_norm, 0, len(opening_norm) + 50) != -1:
             return para
 
     return None
 
 
-def extract_summaries_and_content(source_file: str) -> List[dict]:
+def extract_summaries_and_content(source_file: str) -> List[Entry]:
     """
     Extract summaries from the index section and find their matching content.
-    Returns list of {author, opening_words, summary_text, full_content}
+    Returns list of Entry(author, opening_words, summary_text, full_content)
     """
     with open(source_file, 'r', encoding='utf-8') as f:
         content = f.read()
-        lines = content.split('\n')
 
     results = []
 
-    # Find summary section (lines ~76-470)
-    # Find content section start
-    content_start = 0
-    for i, line in enumerate(lines):
-        if '<center><h1><b>רבינו בחיי</b></h1></center>' in line:
-            content_start = i
-            break
+    # Find content section start (offset of the line holding the first content header).
+    # Only the text before it (TOC + summary index, lines ~76-470) is split into lines;
+    # content sections are located directly in the full text below
+    content_offset = content.find('<center><h1><b>רבינו בחיי</b></h1></center>')
+    if content_offset > 0:
+        content_offset = content.rfind('\n', 0, content_offset) + 1
 
-    if content_start == 0:
-        content_start = 474  # Fallback
+    if content_offset > 0:
+        lines = content[:content_offset].split('\n')[:-1]
+    else:
+        lines = content.split('\n', 474)[:474]  # Fallback
+        content_offset = sum(len(line) + 1 for line in lines)
+    summary_end = len(lines)
 
     # Parse summaries from index
     current_author = None
-    summary_pattern = re.compile(r'^<b>([^<]+)</b>[\-–—](.+)$')
-    author_header = re.compile(r'<center><b>([^<]+)</b></center>')
+    author_sections = []
 
     # Build author -> content mapping
     author_content = {}
-    current_content_author = None
-    current_content_lines = []
 
     # First pass: extract all content sections
-    author_h1 = re.compile(r'<center><h1>(?:<b>)?([^<]+)(?:</b>)?</h1></center>')
-
-    for i, line in enumerate(lines[content_start:], start=content_start):
-        match = author_h1.search(line)
-        if match:
-            # Save previous
-            if current_content_author and current_content_lines:
-                if current_content_author not in author_content:
-                    author_content[current_content_author] = []
-                author_content[current_content_author].append('\n'.join(current_content_lines))
-
-            current_content_author = match.group(1).strip()
-            current_content_lines = []
-        elif current_content_author:
-            current_content_lines.append(line)
-
-    # Save last
-    if current_content_author and current_content_lines:
-        if current_content_author not in author_content:
-            author_content[current_content_author] = []
-        author_content[current_content_author].append('\n'.join(current_content_lines))
+    # One finditer over the text finds every author header line; each section's
+    # body is the text between consecutive header lines
+    headers = list(_AUTHOR_H1_LINE_RE.finditer(content, content_offset))
+
+    for k, match in enumerate(headers):
+        current_content_author = match.group(1).strip()
+        body_start = match.end() + 1
+        body_end = headers[k + 1].start() - 1 if k + 1 < len(headers) else len(content)
+        if body_start > body_end:
+            continue  # Header immediately followed by another header
+        current_content_lines = content[body_start:body_end].split('\n')
+
+        if current_content_author:
+            if current_content_author not in author_content:
+                author_content[current_content_author] = []
+            author_content[current_content_author].append(split_paragraphs(current_content_lines))
 
     print(f"Found content for {len(author_content)} authors")
 
     # Second pass: extract summaries and match to content
-    for i, line in enumerate(lines[76:content_start], start=76):
+    for i, line in enumerate(lines[76:summary_end], start=76):
         # Check for author header
-        author_match = author_header.search(line)
+        author_match = _AUTHOR_HEADER_RE.search(line)
         if author_match:
             current_author = author_match.group(1).strip()
+            # Resolve this author's content sections once (fuzzy author match),
+            # instead of re-scanning every content author for each summary
+            author_sections = [
+                paragraphs
+                for content_author, sections in author_content.items()
+                if current_author in content_author or content_author in current_author
+                for paragraphs in sections
+            ]
             continue
 
         # Check for summary
@@ -132,7 +248,7 @@ def extract_summaries_and_content(source_file: str) -> List[dict]:
             # Accumulate multi-line summary
             summary_lines = [line.strip()]
             j = i + 1
-            while j < content_start and j - 76 < len(lines[76:content_start]):
+            while j < summary_end:
                 next_line = lines[j].strip()
                 if not next_line or '<center>' in next_line or next_line.startswith('<b>'):
                     break
@@ -142,11 +258,11 @@ def extract_summaries_and_content(source_file: str) -> List[dict]:
             full_summary = ' '.join(summary_lines)
 
             # Parse opening words and summary text
-            match = summary_pattern.match(full_summary.split('\n')[0] if '\n' in full_summary else full_summary)
+            match = _SUMMARY_RE.match(full_summary.split('\n')[0] if '\n' in full_summary else full_summary)
             if not match:
                 # Try matching just the first line
                 first_line = summary_lines[0]
-                match = summary_pattern.match(first_line)
+                match = _SUMMARY_RE.match(first_line)
 
             if match:
                 opening_words = match.group(1).strip()
@@ -157,128 +273,50 @@ def extract_summaries_and_content(source_file: str) -> List[dict]:
                     summary_rest += ' ' + ' '.join(summary_lines[1:])
 
                 # Clean up - remove page number at end
-                summary_rest = re.sub(r'\.{2,}[א-ת"\']+\s*$', '', summary_rest)
-                summary_rest = re.sub(r'\s+[א-ת][\'"]?[א-ת]?\s*$', '', summary_rest)
+                if '..' in summary_rest:
+                    summary_rest = _PAGE_DOTS_RE.sub('', summary_rest)
+                summary_rest = _PAGE_TAIL_RE.sub('', summary_rest)
                 summary_rest = clean_html_tags(summary_rest)
 
                 # Find matching content
                 full_content = None
 
-                # Look for this author in content
-                for content_author, sections in author_content.items():
-                    # Fuzzy author match
-                    if current_author in content_author or content_author in current_author:
-                        # Search in all sections for this author
-                        for section in sections:
-                            para = find_matching_paragraph(opening_words, section)
-                            if para:
-                                full_content = para
-                                break
-                        if full_content:
-                            break
+                # Search in all content sections for this author
+                for paragraphs in author_sections:
+                    para = find_matching_paragraph(opening_words, paragraphs)
+                    if para:
+                        full_content = para
+                        break
 
                 if full_content and len(summary_rest) > 20:
-                    results.append({
-                        'author': current_author,
-                        'opening_words': opening_words,
-                        'summary_text': summary_rest,
-                        'full_content': full_content
-                    })
+                    results.append(Entry(
+                        author=current_author,
+                        opening_words=opening_words,
+                        summary_text=summary_rest,
+                        full_content=full_content
+                    ))
 
     return results
 
 
-def generate_html(entries: List[dict], output_file: str):
-    """Generate HTML with proper RTL support"""
-
-    html = '''<!DOCTYPE html>
-<html dir="rtl" lang="he">
-<head>
-    <meta charset="UTF-8">
-    <title>פרשת בשלח - ליקוטי ספרי חסידות</title>
-    <style>
-        @page {
-            size: A4;
-            margin: 2cm;
-        }
-        body {
-            font-family: 'David', 'Times New Roman', serif;
-            direction: rtl;
-            text-align: right;
-            line-height: 1.6;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-        }
-        .entry {
-            page-break-after: always;
-            margin-bottom: 40px;
-        }
-        .entry:last-child {
-            page-break-after: avoid;
-        }
-        .header {
-            font-size: 18pt;
-            font-weight: bold;
-            margin-bottom: 15px;
-            color: #333;
-        }
-        .summary {
-            font-size: 14pt;
-            margin-bottom: 30px;
-            text-align: justify;
-        }
-        .separator {
-            border-top: 1px solid #999;
-            margin: 20px 0;
-        }
-        .source-header {
-            font-size: 14pt;
-            font-weight: bold;
-            text-align: center;
-            margin: 15px 0;
-            text-decoration: underline;
-        }
-        .content {
-            font-size: 11pt;
-            text-align: justify;
-            color: #444;
-        }
-        .entry-number {
-            font-weight: bold;
-        }
-        h1 {
-            text-align: center;
-            font-size: 24pt;
-            margin-bottom: 30px;
-        }
-    </style>
-</head>
-<body>
-    <h1>פרשת בשלח</h1>
-    <h2 style="text-align: center;">ליקוטי ספרי חסידות עם מפתח ענינים</h2>
-'''
+def write_html(entries: List[Entry], f):
+    """Write the HTML document to an open text file, one entry at a time"""
+    f.write(_HTML_HEAD)
 
     for i, entry in enumerate(entries, 1):
-        html += f'''
-    <div class="entry">
-        <div class="header">{entry['opening_words']} - {entry['author']}</div>
-        <div class="summary">{entry['summary_text']}</div>
-        <div class="separator"></div>
-        <div class="source-header">מקור השפע</div>
-        <div class="content">
-            <span class="entry-number">[{i}]</span> {entry['full_content']}
-        </div>
-    </div>
-'''
+        f.write(_ENTRY_TPL % (entry.opening_words.translate(_HTML_ESCAPE),
+                              entry.author.translate(_HTML_ESCAPE),
+                              entry.summary_text.translate(_HTML_ESCAPE),
+                              i, entry.full_content.translate(_HTML_ESCAPE)))
 
-    html += '''
-</body>
-</html>
-'''
+    f.write(_HTML_TAIL)
 
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(html)
+
+def generate_html(entries: List[Entry], output_file: str):
+    """Generate HTML with proper RTL support"""
+    # 1 MB buffer: the per-entry writes reach the disk as a few large sequential writes
+    with open(output_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        write_html(entries, f)
 
     print(f"HTML saved: {output_file}")
     print(f"Total entries: {len(entries)}")
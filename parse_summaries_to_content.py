@@ -12,10 +12,63 @@ Strategy:
 
 import re
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
-from difflib import SequenceMatcher
-
-@dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Optional, Set, Tuple
+
+from rapidfuzz import fuzz, process
+
+# Headers that look like author headers but aren't (page titles / markers)
+_GENERIC_HEADERS = frozenset(['פרשת בשלח', 'בס"ד'])
+
+# normalize_text: drop nikud, turn punctuation into spaces (one translate pass)
+_NORMALIZE_TABLE = {c: None for c in range(0x0591, 0x05C8)}
+_NORMALIZE_TABLE.update({ord(c): ' ' for c in '.,;:!?-\u2013\u2014'})
+
+# TOC entry: <b>Author Name</b>......'page
+_TOC_RE = re.compile(r'<b>([^<]+)</b>\.+\s*([\'"]?[א-ת"\']+)')
+
+# Summary index: author header (plain or <h1>), one search per line
+_SUMMARY_AUTHOR_RE = re.compile(
+    r'<center><b>([^<]+)</b></center>'
+    r'|<center><h1><b>([^<]+)</b></h1></center>'
+)
+# Start of a summary: <b>Opening</b>-
+_SUMMARY_START_RE = re.compile(r'^<b>([^<]+)</b>[\-–—](.*)$')
+# Page number at end of summary (dots followed by Hebrew letters), or like "כ"א" at end
+_PAGE_END_RE = re.compile(r'\.{2,}\s*([א-ת"\']+)\s*$')
+_PAGE_ALT_RE = re.compile(r'\s+([א-ת][\'"]?[א-ת]?)\s*$')
+_DOTS_RE = re.compile(r'\.{2,}')
+
+# Author content headers, as one alternation (one search per line):
+#   <center><h1><b>Author</b></h1></center>
+#   <center><h1>Author</h1></center>
+#   <header>Author</header> (standalone)
+_CONTENT_AUTHOR_RE = re.compile(
+    r'<center><h1><b>([^<]+)</b></h1></center>'
+    r'|<center><h1>([^<]+)</h1></center>'
+    r'|^<header>([^<]+)</header>$'
+)
+# Page footers (<footer><center>page</center></footer> or <footer>page</footer>)
+_PAGE_FOOTER_RE = re.compile(
+    r'<footer><center>([א-ת"\']+)</center></footer>'
+    r'|<footer>([א-ת"\']+)</footer>'
+)
+# Bold paragraph openings in content
+_BOLD_RE = re.compile(r'<b>([^<]+)</b>')
+
+# Hebrew letter values for hebrew_page_to_int
+_HEB_VALS = {
+    'א': 1, 'ב': 2, 'ג': 3, 'ד': 4, 'ה': 5, 'ו': 6, 'ז': 7, 'ח': 8, 'ט': 9,
+    'י': 10, 'כ': 20, 'ל': 30, 'מ': 40, 'נ': 50, 'ס': 60, 'ע': 70, 'פ': 80, 'צ': 90,
+    'ק': 100, 'ר': 200, 'ש': 300, 'ת': 400
+}
+
+# Highest score _find_best_section can give a section (summed in the same
+# order as there): exact opening + opening in content + same page + same author
+_PERFECT_SCORE = 1.0 * 0.4 + 0.15 + 0.3 + 1.0 * 0.3
+
+@dataclass(slots=True)
 class Summary:
     author: str
     opening_words: str  # The bold text at start (verse/topic reference)
@@ -24,8 +77,10 @@ class Summary:
     line_number: int
     matched_content: Optional['ContentSection'] = None
     match_confidence: float = 0.0
+    opening_normalized: str = ''  # normalize_text(opening_words), set at extraction
+    page_value: int = 0           # hebrew_page_to_int(page_ref), 0 if no page
 
-@dataclass
+@dataclass(slots=True)
 class ContentSection:
     author: str
     text: str
@@ -33,8 +88,12 @@ class ContentSection:
     start_line: int
     end_line: int
     opening_phrases: List[str] = field(default_factory=list)  # First few words of paragraphs
+    # normalize_text() of text / opening_phrases, set at extraction
+    normalized_text: str = ''
+    normalized_phrases: List[str] = field(default_factory=list)
+    page_value: int = 0  # hebrew_page_to_int(page_number), 0 if no page
 
-@dataclass
+@dataclass(slots=True)
 class Author:
     name: str
     page_start: str  # Hebrew page number
@@ -42,36 +101,26 @@ class Author:
     content_sections: List[ContentSection] = field(default_factory=list)
 
 
+@lru_cache(maxsize=4096)
 def hebrew_page_to_int(page: str) -> int:
     """Convert Hebrew page number to integer for comparison"""
-    hebrew_nums = {
-        'א': 1, 'ב': 2, 'ג': 3, 'ד': 4, 'ה': 5, 'ו': 6, 'ז': 7, 'ח': 8, 'ט': 9,
-        'י': 10, 'כ': 20, 'ל': 30, 'מ': 40, 'נ': 50, 'ס': 60, 'ע': 70, 'פ': 80, 'צ': 90,
-        'ק': 100, 'ר': 200, 'ש': 300, 'ת': 400
-    }
-    # Clean up the page string
-    page = page.replace("'", "").replace('"', '').replace(' ', '')
-    total = 0
-    for char in page:
-        if char in hebrew_nums:
-            total += hebrew_nums[char]
-    return total
+    # Quote marks, spaces and other characters have no value, so they are skipped
+    return sum(_HEB_VALS.get(char, 0) for char in page)
 
 
+@lru_cache(maxsize=4096)
 def normalize_text(text: str) -> str:
     """Normalize Hebrew text for comparison"""
     # Remove nikud, punctuation, extra spaces
-    text = re.sub(r'[\u0591-\u05C7]', '', text)  # Remove nikud
-    text = re.sub(r'[.,;:!?\-\u2013\u2014]', ' ', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    return ' '.join(text.translate(_NORMALIZE_TABLE).split())
 
 
+@lru_cache(maxsize=4096)
 def similarity_score(a: str, b: str) -> float:
-    """Calculate similarity between two strings"""
+    """Calculate similarity between two strings (0.0 - 1.0)"""
     a_norm = normalize_text(a)
     b_norm = normalize_text(b)
-    return SequenceMatcher(None, a_norm, b_norm).ratio()
+    return fuzz.ratio(a_norm, b_norm) / 100.0
 
 
 def extract_opening_words(text: str, num_words: int = 5) -> str:
@@ -87,6 +136,10 @@ class DocumentParser:
         self.authors: Dict[str, Author] = {}
         self.summaries: List[Summary] = []
         self.content_sections: List[ContentSection] = []
+        # (raw name, threshold) -> resolved author name, see _resolve_author
+        self._author_resolution: Dict[Tuple[str, float], str] = {}
+        # Line of the first content header (0 if not found), shared by both extractors
+        self._content_start = self._find_content_start()
 
     def parse(self):
         """Main parsing pipeline"""
@@ -106,12 +159,13 @@ class DocumentParser:
 
     def _extract_authors_from_toc(self):
         """Extract author names and page numbers from main TOC (lines 15-75 approx)"""
-        # Pattern: <b>Author Name</b>......'page
-        toc_pattern = re.compile(r'<b>([^<]+)</b>\.+\s*([\'"]?[א-ת"\']+)')
-
-        for i, line in enumerate(self.lines[:100]):  # TOC is in first 100 lines
-            match = toc_pattern.search(line)
-            if match and i >= 14:  # Skip header lines
+        # TOC is in first 100 lines; skip the 14 header lines
+        for line in islice(self.lines, 14, 100):
+            # Every TOC entry contains '</b>.': skip the regex on lines without it
+            if '</b>.' not in line:
+                continue
+            match = _TOC_RE.search(line)
+            if match:
                 author_name = match.group(1).strip()
                 page = match.group(2).strip()
                 if author_name not in self.authors:
@@ -119,6 +173,35 @@ class DocumentParser:
 
         print(f"   Found {len(self.authors)} authors in TOC")
 
+    def _find_content_start(self) -> int:
+        """Index of the content header line for the first author (after the summary index), or 0"""
+        for i, line in enumerate(islice(self.lines, 401, None), start=401):
+            if '<header>' in line and 'רבינו בחיי' in line:
+                return i
+        return 0
+
+    def _resolve_author(self, name: str, threshold: float) -> str:
+        """
+        Return the first known author whose similarity to name exceeds threshold,
+        or name itself. Callers register unmatched names in self.authors, so a
+        resolution never changes later and can be memoized per (name, threshold).
+        """
+        key = (name, threshold)
+        resolved = self._author_resolution.get(key)
+        if resolved is None:
+            resolved = name
+            known_names = list(self.authors)
+            # extract_iter yields known names at/above the cutoff in order, so the
+            # first one with a strictly higher score is the first match
+            for _, score, idx in process.extract_iter(
+                    normalize_text(name), [normalize_text(known) for known in known_names],
+                    scorer=fuzz.ratio, score_cutoff=threshold * 100):
+                if score / 100.0 > threshold:
+                    resolved = known_names[idx]
+                    break
+            self._author_resolution[key] = resolved
+        return resolved
+
     def _extract_summaries(self):
         """Extract summaries grouped by author from the summary index section"""
         current_author = None
@@ -129,51 +212,44 @@ class DocumentParser:
         current_summary_opening = None
         current_summary_lines = []
 
-        # Pattern for author headers in summary section
-        author_header = re.compile(r'<center><b>([^<]+)</b></center>')
-        author_header_h1 = re.compile(r'<center><h1><b>([^<]+)</b></h1></center>')
-
-        # Pattern to detect start of a summary: <b>Opening</b>-
-        summary_start_pattern = re.compile(r'^<b>([^<]+)</b>[\-–—](.*)$')
-
-        # Pattern for page number at end of line (dots followed by Hebrew letters)
-        page_end_pattern = re.compile(r'\.{2,}\s*([א-ת"\']+)\s*$')
-
-        # Also match page patterns like "כ"א" at end
-        page_alt_pattern = re.compile(r'\s+([א-ת][\'"]?[א-ת]?)\s*$')
-
         # Find where summary section starts (after TOC, before content)
         summary_section_start = 76  # After TOC
-        content_start = 0
-        for i, line in enumerate(self.lines):
-            if '<header>' in line.lower() and 'רבינו בחיי' in line and i > 400:
-                content_start = i
-                break
-
-        if content_start == 0:
-            content_start = len(self.lines)
+        content_start = self._content_start or len(self.lines)
 
         def save_current_summary():
             nonlocal current_summary_start, current_summary_opening, current_summary_lines
             if current_summary_opening and current_summary_lines:
-                full_text = ' '.join(current_summary_lines)
-                # Extract page number from end
-                page_match = page_end_pattern.search(full_text)
+                # Extract page number from end (dot leaders need '..': skip the regex otherwise).
+                # The dot leaders are normally on the last line, and a match there is also the
+                # leftmost match in the joined text (only one run of dots fits in a match),
+                # so search that line alone and slice it before joining
+                last_line = current_summary_lines[-1]
+                page_match = _PAGE_END_RE.search(last_line) if '..' in last_line else None
                 if page_match:
                     page = page_match.group(1).strip()
-                    text = full_text[:page_match.start()].strip()
+                    text_lines = current_summary_lines[:-1]
+                    text_lines.append(last_line[:page_match.start()])
+                    text = ' '.join(text_lines).strip()
                 else:
-                    # Try alternative pattern
-                    page_match = page_alt_pattern.search(full_text)
+                    # Page may follow dot leaders on an earlier line
+                    full_text = ' '.join(current_summary_lines)
+                    page_match = _PAGE_END_RE.search(full_text) if '..' in full_text else None
                     if page_match:
                         page = page_match.group(1).strip()
                         text = full_text[:page_match.start()].strip()
                     else:
-                        page = ''
-                        text = full_text
+                        # Try alternative pattern
+                        page_match = _PAGE_ALT_RE.search(full_text)
+                        if page_match:
+                            page = page_match.group(1).strip()
+                            text = full_text[:page_match.start()].strip()
+                        else:
+                            page = ''
+                            text = full_text
 
                 # Clean up text
-                text = re.sub(r'\.{2,}', '', text).strip()
+                if '..' in text:
+                    text = _DOTS_RE.sub('', text).strip()
 
                 if current_author and len(text) > 10:  # Skip very short entries
                     summary = Summary(
@@ -181,7 +257,9 @@ class DocumentParser:
                         opening_words=current_summary_opening,
                         summary_text=text,
                         page_ref=page,
-                        line_number=current_summary_start
+                        line_number=current_summary_start,
+                        opening_normalized=normalize_text(current_summary_opening),
+                        page_value=hebrew_page_to_int(page)
                     )
                     self.summaries.append(summary)
                     if current_author in self.authors:
@@ -191,7 +269,8 @@ class DocumentParser:
             current_summary_opening = None
             current_summary_lines = []
 
-        for i, line in enumerate(self.lines[summary_section_start:content_start], start=summary_section_start):
+        for i, line in enumerate(islice(self.lines, summary_section_start, content_start),
+                                 start=summary_section_start):
             line_stripped = line.strip()
 
             # Skip empty lines
@@ -199,25 +278,20 @@ class DocumentParser:
                 continue
 
             # Check for author header (starts new author section)
-            match = author_header.search(line) or author_header_h1.search(line)
+            match = _SUMMARY_AUTHOR_RE.search(line)
             if match:
                 # Save any pending summary
                 save_current_summary()
 
-                author_name = match.group(1).strip()
+                author_name = match.group(match.lastindex).strip()
                 # Find matching author (fuzzy match)
-                for name in self.authors:
-                    if similarity_score(name, author_name) > 0.8:
-                        current_author = name
-                        break
-                else:
-                    current_author = author_name
-                    if current_author not in self.authors:
-                        self.authors[current_author] = Author(name=current_author, page_start='')
+                current_author = self._resolve_author(author_name, 0.8)
+                if current_author not in self.authors:
+                    self.authors[current_author] = Author(name=current_author, page_start='')
                 continue
 
             # Check for start of new summary
-            start_match = summary_start_pattern.match(line_stripped)
+            start_match = _SUMMARY_START_RE.match(line_stripped)
             if start_match:
                 # Save previous summary if any
                 save_current_summary()
@@ -249,11 +323,7 @@ class DocumentParser:
         current_page = ''
 
         # Find where content starts (after summary index)
-        content_start = 0
-        for i, line in enumerate(self.lines):
-            if '<header>' in line.lower() and 'רבינו בחיי' in line and i > 400:
-                content_start = i
-                break
+        content_start = self._content_start
 
         if content_start == 0:
             # Fallback: look for first h1 author header
@@ -262,56 +332,39 @@ class DocumentParser:
                     content_start = i
                     break
 
-        # Multiple patterns for author content headers
-        author_patterns = [
-            re.compile(r'<center><h1><b>([^<]+)</b></h1></center>'),  # <center><h1><b>Author</b></h1></center>
-            re.compile(r'<center><h1>([^<]+)</h1></center>'),  # <center><h1>Author</h1></center>
-            re.compile(r'^<header>([^<]+)</header>$'),  # <header>Author</header> (standalone)
-        ]
-
-        # Pattern for page footers
-        page_footer = re.compile(r'<footer><center>([א-ת"\']+)</center></footer>')
-
-        # Also capture page numbers from footer tags
-        page_footer_alt = re.compile(r'<footer>([א-ת"\']+)</footer>')
-
         def match_author(line: str) -> Optional[str]:
             """Try to match author name from line"""
-            for pattern in author_patterns:
-                match = pattern.search(line)
-                if match:
-                    name = match.group(1).strip()
-                    # Skip generic headers
-                    if name in ['פרשת בשלח', 'בס"ד']:
-                        return None
-                    return name
+            match = _CONTENT_AUTHOR_RE.search(line)
+            if match:
+                name = match.group(match.lastindex).strip()
+                # Skip generic headers
+                if name in _GENERIC_HEADERS:
+                    return None
+                return name
             return None
 
-        def find_author_match(name: str) -> str:
-            """Find matching author from known authors"""
-            for known_name in self.authors:
-                if similarity_score(known_name, name) > 0.7:
-                    return known_name
-            return name
-
         def save_section():
             nonlocal current_author, current_text, current_start, current_page
             if current_author and current_text:
                 text = '\n'.join(current_text)
                 if len(text.strip()) > 50:  # Skip very short sections
+                    opening_phrases = self._extract_paragraph_openings(text)
                     section = ContentSection(
                         author=current_author,
                         text=text,
                         page_number=current_page,
                         start_line=current_start,
                         end_line=i,
-                        opening_phrases=self._extract_paragraph_openings(text)
+                        opening_phrases=opening_phrases,
+                        normalized_text=normalize_text(text),
+                        normalized_phrases=[normalize_text(phrase) for phrase in opening_phrases],
+                        page_value=hebrew_page_to_int(current_page)
                     )
                     self.content_sections.append(section)
                     if current_author in self.authors:
                         self.authors[current_author].content_sections.append(section)
 
-        for i, line in enumerate(self.lines[content_start:], start=content_start):
+        for i, line in enumerate(islice(self.lines, content_start, None), start=content_start):
             # Check for author header
             author_name = match_author(line)
             if author_name:
@@ -319,7 +372,7 @@ class DocumentParser:
                 save_section()
 
                 # Start new section
-                current_author = find_author_match(author_name)
+                current_author = self._resolve_author(author_name, 0.7)
                 if current_author not in self.authors:
                     self.authors[current_author] = Author(name=current_author, page_start='')
 
@@ -329,9 +382,9 @@ class DocumentParser:
                 continue
 
             # Check for page footer
-            page_match = page_footer.search(line) or page_footer_alt.search(line)
+            page_match = _PAGE_FOOTER_RE.search(line)
             if page_match:
-                current_page = page_match.group(1).strip()
+                current_page = page_match.group(page_match.lastindex).strip()
 
             # Accumulate text
             if current_author:
@@ -347,8 +400,7 @@ class DocumentParser:
         """Extract opening words from paragraphs marked with <b> tags"""
         openings = []
         # Find bold text that starts paragraphs
-        bold_pattern = re.compile(r'<b>([^<]+)</b>')
-        for match in bold_pattern.finditer(text):
+        for match in _BOLD_RE.finditer(text):
             opening = match.group(1).strip()
             if len(opening) > 2:  # Skip very short matches
                 openings.append(opening)
@@ -358,78 +410,145 @@ class DocumentParser:
         """Map each summary to its corresponding content section - STRICT AUTHOR MATCHING"""
         mapped = 0
 
+        # Inverted index: normalized opening phrase -> indices of sections containing it,
+        # so exact opening matches are a lookup instead of a scan over every phrase
+        phrase_index: Dict[str, Set[int]] = {}
+        for section_idx, section in enumerate(self.content_sections):
+            for phrase_norm in section.normalized_phrases:
+                phrase_index.setdefault(phrase_norm, set()).add(section_idx)
+
+        # Section indices per section author, and per summary author the same-author
+        # candidates [(section index, author similarity)] in section order, so each
+        # summary only scores sections that pass the author gate
+        sections_by_author: Dict[str, List[int]] = {}
+        for section_idx, section in enumerate(self.content_sections):
+            sections_by_author.setdefault(section.author, []).append(section_idx)
+        candidates_by_author: Dict[str, List[Tuple[int, float]]] = {}
+
+        # Summaries with the same author, opening words and page score identically
+        match_cache: Dict[Tuple[str, str, str], Tuple[Optional[ContentSection], float]] = {}
+
         for summary in self.summaries:
-            best_match = None
-            best_score = 0
-
-            # Get content sections for this author ONLY (strict match)
-            author_sections = []
-            for section in self.content_sections:
-                author_sim = similarity_score(section.author, summary.author)
-                # STRICT: Only match if author similarity > 0.7 (same author)
-                if author_sim > 0.7:
-                    author_sections.append((section, author_sim))
-
-            # NO FALLBACK - if no same-author content, skip this summary
-            if not author_sections:
-                continue  # Don't match to different author
-
-            for section, author_sim in author_sections:
-                score = 0
-
-                # Signal 1: Opening words match (weight: 40%)
-                opening_normalized = normalize_text(summary.opening_words)
-
-                # Check opening phrases (bold text in content)
-                best_phrase_score = 0
-                for phrase in section.opening_phrases:
-                    phrase_norm = normalize_text(phrase)
-                    # Exact match or containment
-                    if opening_normalized == phrase_norm:
-                        best_phrase_score = 1.0
-                        break
-                    elif opening_normalized in phrase_norm:
+            opening_normalized = summary.opening_normalized
+            key = (summary.author, opening_normalized, summary.page_ref)
+            if key not in match_cache:
+                candidates = candidates_by_author.get(summary.author)
+                if candidates is None:
+                    candidates = self._author_candidates(summary.author, sections_by_author)
+                    candidates_by_author[summary.author] = candidates
+                match_cache[key] = self._find_best_section(summary, opening_normalized,
+                                                           candidates, phrase_index)
+            best_match, best_score = match_cache[key]
+
+            if best_match and best_score > 0.25:
+                summary.matched_content = best_match
+                summary.match_confidence = best_score
+                mapped += 1
+
+        print(f"   Mapped {mapped}/{len(self.summaries)} summaries ({100*mapped/len(self.summaries):.1f}%)")
+
+    @staticmethod
+    def _author_candidates(author: str,
+                           sections_by_author: Dict[str, List[int]]) -> List[Tuple[int, float]]:
+        """(section index, author similarity) for sections whose author matches, in section order"""
+        candidates = []
+        for section_author, indices in sections_by_author.items():
+            author_sim = similarity_score(section_author, author)
+            # STRICT: Only match if author similarity > 0.7 (same author)
+            # NO FALLBACK - if no same-author content, this summary stays unmatched
+            if author_sim > 0.7:
+                candidates.extend((section_idx, author_sim) for section_idx in indices)
+        candidates.sort()
+        return candidates
+
+    def _find_best_section(self, summary: Summary, opening_normalized: str,
+                           candidates: List[Tuple[int, float]],
+                           phrase_index: Dict[str, Set[int]]) -> Tuple[Optional[ContentSection], float]:
+        """Score same-author candidate sections for one summary; return (best section, score)"""
+        best_match = None
+        best_score = 0
+
+        # Sections whose opening phrases include this opening exactly
+        exact_sections = phrase_index.get(opening_normalized, set())
+
+        # Score content sections for this author ONLY (strict match) in one pass,
+        # keeping just the best so far
+        for section_idx, author_sim in candidates:
+            section = self.content_sections[section_idx]
+
+            # Signal 2: Page number match (weight: 30%)
+            page_score = 0
+            if summary.page_ref and section.page_number:
+                page_diff = abs(summary.page_value - section.page_value)
+                if page_diff == 0:
+                    page_score = 0.3
+                elif page_diff <= 1:
+                    page_score = 0.2
+                elif page_diff <= 3:
+                    page_score = 0.1
+
+            # Skip sections that can't beat the best even with a perfect opening match
+            # (summed in the same order as score below, so the bound is never too low)
+            if 1.0 * 0.4 + 0.15 + page_score + author_sim * 0.3 <= best_score:
+                continue
+
+            score = 0
+
+            # Signal 1: Opening words match (weight: 40%)
+            # Check opening phrases (bold text in content)
+            best_phrase_score = 0
+            if section_idx in exact_sections:
+                # Exact match
+                best_phrase_score = 1.0
+            else:
+                fuzzy_phrases = []
+                for phrase_norm in section.normalized_phrases:
+                    # Containment
+                    if opening_normalized in phrase_norm:
                         best_phrase_score = max(best_phrase_score, 0.9)
                     elif phrase_norm in opening_normalized:
                         best_phrase_score = max(best_phrase_score, 0.8)
                     else:
-                        # Fuzzy match
-                        sim = similarity_score(opening_normalized, phrase_norm)
+                        fuzzy_phrases.append(phrase_norm)
+                # Fuzzy match: best of the remaining phrases in one rapidfuzz call;
+                # the cutoff lets rapidfuzz drop phrases that can't raise the score
+                if fuzzy_phrases:
+                    best = process.extractOne(opening_normalized, fuzzy_phrases, scorer=fuzz.ratio,
+                                              score_cutoff=max(70, best_phrase_score * 100))
+                    if best:
+                        sim = best[1] / 100.0
                         if sim > 0.7:
                             best_phrase_score = max(best_phrase_score, sim)
 
-                score += best_phrase_score * 0.4
+            score += best_phrase_score * 0.4
 
-                # Also check if opening words appear anywhere in content (bonus)
-                content_normalized = normalize_text(section.text)
-                if opening_normalized in content_normalized:
-                    score += 0.15
+            # Also check if opening words appear anywhere in content (bonus)
+            if opening_normalized in section.normalized_text:
+                score += 0.15
 
-                # Signal 2: Page number match (weight: 30%)
-                if summary.page_ref and section.page_number:
-                    summary_page = hebrew_page_to_int(summary.page_ref)
-                    section_page = hebrew_page_to_int(section.page_number)
-                    page_diff = abs(summary_page - section_page)
-                    if page_diff == 0:
-                        score += 0.3
-                    elif page_diff <= 1:
-                        score += 0.2
-                    elif page_diff <= 3:
-                        score += 0.1
+            score += page_score
 
-                # Signal 3: Author match (weight: 30%)
-                score += author_sim * 0.3
+            # Signal 3: Author match (weight: 30%)
+            score += author_sim * 0.3
 
-                if score > best_score:
-                    best_score = score
-                    best_match = section
+            if score > best_score:
+                best_score = score
+                best_match = section
+                # Nothing later can beat a perfect score (ties keep the first)
+                if score >= _PERFECT_SCORE:
+                    break
 
-            if best_match and best_score > 0.25:
-                summary.matched_content = best_match
-                summary.match_confidence = best_score
-                mapped += 1
+        return best_match, best_score
 
-        print(f"   Mapped {mapped}/{len(self.summaries)} summaries ({100*mapped/len(self.summaries):.1f}%)")
+    def _match_statistics(self) -> Tuple[int, int, int]:
+        """(total, matched, high confidence >70%) summary counts, in one pass"""
+        matched = high_conf = 0
+        for s in self.summaries:
+            if s.matched_content:
+                matched += 1
+            if s.match_confidence > 0.7:
+                high_conf += 1
+        return len(self.summaries), matched, high_conf
 
     def get_mapping_report(self) -> str:
         """Generate a report of all mappings"""
@@ -456,9 +575,7 @@ class DocumentParser:
                     lines.append(f"  -> Lines: {summary.matched_content.start_line}-{summary.matched_content.end_line}")
 
         # Statistics
-        total = len(self.summaries)
-        matched = sum(1 for s in self.summaries if s.matched_content)
-        high_conf = sum(1 for s in self.summaries if s.match_confidence > 0.7)
+        total, matched, high_conf = self._match_statistics()
 
         lines.append("\n" + "=" * 80)
         lines.append("STATISTICS")
@@ -472,12 +589,13 @@ class DocumentParser:
 
     def export_json(self) -> dict:
         """Export mapping as JSON-serializable dict"""
+        total, matched, high_conf = self._match_statistics()
         result = {
             'authors': [],
             'statistics': {
-                'total_summaries': len(self.summaries),
-                'matched': sum(1 for s in self.summaries if s.matched_content),
-                'high_confidence': sum(1 for s in self.summaries if s.match_confidence > 0.7)
+                'total_summaries': total,
+                'matched': matched,
+                'high_confidence': high_conf
             }
         }
 